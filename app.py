@@ -4,11 +4,21 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import duckdb
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import io
 import warnings
 warnings.filterwarnings('ignore')
 
+# Copy-on-Write turns column selections and slices into lazy views (always on from pandas 3.0)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 # Page configuration
 st.set_page_config(
     page_title="Amazon Sales Analysis Dashboard",
@@ -52,21 +62,340 @@ st.markdown("""
 st.markdown('<h1 class="main-header">📊 Amazon Sales Analysis Dashboard</h1>', unsafe_allow_html=True)
 
 # Load data
+@st.cache_resource
+def load_table():
+    return pq.read_table('amazon_sales_data.parquet')
+
 @st.cache_data
 def load_data():
+    """
+    Load the dataset once and precompute the sidebar filter options
+    """
     try:
-        df = pd.read_csv('amazon_sales_data.csv')
-        # Convert date columns
-        df['Order_Date'] = pd.to_datetime(df['Order_Date'])
-        df['Delivery_Date'] = pd.to_datetime(df['Delivery_Date'])
-        return df
+        table = load_table()
     except FileNotFoundError:
         st.error("Please run generate_amazon_data.py first to create the dataset!")
         return None
+    
+    # Computed on the Arrow columns directly; Order_Date is already a timestamp
+    order_dates = pc.min_max(table['Order_Date'])
+    return {
+        'categories': ['All'] + sorted(pc.unique(table['Category']).to_pylist()),
+        'cities': ['All'] + sorted(pc.unique(table['City']).to_pylist()),
+        'segments': ['All'] + sorted(pc.unique(table['Customer_Segment']).to_pylist()),
+        'min_date': order_dates['min'].as_py().date(),
+        'max_date': order_dates['max'].as_py().date()
+    }
 
-df = load_data()
+@st.cache_resource
+def get_connection():
+    return duckdb.connect()
 
-if df is not None:
+def build_filter(category, city, segment, start_date, end_date):
+    """
+    Translate the sidebar selections into a SQL predicate and its parameters
+    """
+    # Half-open timestamp range, so the whole end day is included without casting to dates
+    conditions = ['Order_Date >= ?', 'Order_Date < ?']
+    params = [np.datetime64(start_date), np.datetime64(end_date) + np.timedelta64(1, 'D')]
+    
+    for column, value in [('Category', category), ('City', city), ('Customer_Segment', segment)]:
+        if value != 'All':
+            conditions.append(f'{column} = ?')
+            params.append(value)
+    
+    return ' AND '.join(conditions), params
+
+def open_cursor():
+    # Each rerun gets its own cursor; registering the Arrow table is zero-copy
+    cursor = get_connection().cursor()
+    cursor.register('orders', load_table())
+    return cursor
+
+def select_filtered(cursor, filters, columns=None, limit=None):
+    where, params = build_filter(*filters)
+    selection = ', '.join(columns) if columns else '*'
+    query = f"SELECT {selection} FROM orders WHERE {where}"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return cursor.execute(query, params).fetch_arrow_table()
+
+@st.cache_data(show_spinner=False)
+def filter_orders(*filters, columns=None, limit=None):
+    """
+    Run the sidebar filters as a single DuckDB scan over the Arrow table,
+    materializing only the requested columns and rows
+    """
+    return select_filtered(open_cursor(), filters, columns, limit).to_pandas()
+
+# Export payloads are full-size copies of the filtered data, so keep only a few
+@st.cache_data(show_spinner=False, max_entries=2)
+def export_orders(*filters, file_format='parquet'):
+    """
+    Serialize the filtered orders with Arrow's C++ Parquet/CSV writers
+    """
+    table = select_filtered(open_cursor(), filters)
+    buffer = io.BytesIO()
+    
+    if file_format == 'parquet':
+        pq.write_table(table, buffer, compression='zstd')
+    else:
+        # Dates are whole days, so write them without the time component
+        for col in ['Order_Date', 'Delivery_Date']:
+            table = table.set_column(table.schema.get_field_index(col), col, table[col].cast(pa.date32()))
+        pa_csv.write_csv(table, buffer)
+    
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def aggregate_orders(*filters):
+    """
+    Compute every KPI and chart aggregate from one filtered scan
+    """
+    cursor = open_cursor()
+    filtered = select_filtered(cursor, filters)
+    cursor.register('f', filtered)
+    
+    def fetch(query):
+        return cursor.execute(query).df()
+    
+    def fetch_series(query):
+        result = fetch(query)
+        return result.set_index(result.columns[0])[result.columns[1]]
+    
+    summary = fetch("""
+        SELECT COALESCE(SUM(Final_Price), 0) AS total_sales,
+               AVG(Final_Price) AS avg_order_value,
+               COUNT(*) AS total_orders,
+               AVG(Customer_Rating) AS avg_rating,
+               AVG(Returned_flag) * 100 AS return_rate,
+               AVG(Delivery_Days) AS avg_delivery_days,
+               AVG(OnTime_flag) * 100 AS on_time_rate
+        FROM f
+    """).to_dict('records')[0]
+    
+    # Correlation as a single np.corrcoef call on a contiguous (N, 7) float32 matrix
+    numeric_cols = ['Product_Price', 'Quantity', 'Discount_Percent', 'Final_Price', 
+                   'Customer_Rating', 'Delivery_Days', 'Profit_Margin']
+    numeric = np.empty((filtered.num_rows, len(numeric_cols)), dtype=np.float32)
+    for i, col in enumerate(numeric_cols):
+        numeric[:, i] = filtered[col].to_numpy()
+    corr = np.corrcoef(numeric, rowvar=False, dtype=np.float32).astype(np.float64)
+    # Round away float32 noise so the heatmap labels read 1 on the diagonal, not 0.9999999
+    correlation = pd.DataFrame(corr, index=numeric_cols, columns=numeric_cols).round(4)
+    
+    return {
+        'summary': summary,
+        'by_category': fetch("""
+            SELECT Category,
+                   SUM(Final_Price) AS sales,
+                   SUM(Profit_Margin) AS profit,
+                   AVG(Customer_Rating) AS rating,
+                   AVG(Delivery_Days) AS delivery_days
+            FROM f GROUP BY Category ORDER BY Category
+        """).set_index('Category'),
+        # Ties go to the alphabetically first method, like pandas mode()
+        'payment': fetch_series("SELECT Payment_Method, COUNT(*) FROM f GROUP BY 1 ORDER BY 2 DESC, 1"),
+        'daily': fetch("SELECT Order_Date, SUM(Final_Price) AS Final_Price FROM f GROUP BY 1 ORDER BY 1"),
+        'top_subcategories': fetch_series("SELECT Subcategory, SUM(Final_Price) FROM f GROUP BY 1 ORDER BY 2 DESC LIMIT 10"),
+        'segment': fetch_series("SELECT Customer_Segment, SUM(Final_Price) FROM f GROUP BY 1 ORDER BY 1"),
+        'top_cities': fetch_series("SELECT City, SUM(Final_Price) FROM f GROUP BY 1 ORDER BY 2 DESC LIMIT 10"),
+        'rating': fetch_series("SELECT Customer_Rating, COUNT(*) FROM f GROUP BY 1 ORDER BY 1"),
+        # Delivery_Days is a whole number of days, so each value is its own bin
+        'delivery_days': fetch_series("SELECT Delivery_Days, COUNT(*) FROM f GROUP BY 1 ORDER BY 1"),
+        'delivery_status': fetch_series("SELECT Delivery_Status, COUNT(*) FROM f GROUP BY 1 ORDER BY 2 DESC"),
+        'monthly': fetch_series("SELECT Order_Month, SUM(Final_Price) FROM f GROUP BY 1 ORDER BY 1"),
+        'weekday': fetch_series("""
+            SELECT Order_DayName, SUM(Final_Price) FROM f
+            GROUP BY Order_DayName, Order_DayOfWeek ORDER BY Order_DayOfWeek
+        """),
+        'correlation': correlation
+    }
+
+# Cached figure builders, keyed on the small aggregates they plot so an
+# unchanged chart is not rebuilt on every rerun
+@st.cache_data(show_spinner=False)
+def fig_category_sales(cat_sales):
+    fig = px.bar(
+        x=cat_sales.values, 
+        y=cat_sales.index,
+        orientation='h',
+        title="Total Sales by Category",
+        labels={'x': 'Total Sales (₹)', 'y': 'Category'},
+        color_discrete_sequence=['#FF9900']
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_payment_methods(payment_dist):
+    fig = px.pie(
+        values=payment_dist.values,
+        names=payment_dist.index,
+        title="Payment Method Distribution",
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_daily_sales(daily_sales):
+    fig = px.line(
+        daily_sales, 
+        x='Order_Date', 
+        y='Final_Price',
+        title="Daily Sales Trend",
+        labels={'Final_Price': 'Sales (₹)', 'Order_Date': 'Date'}
+    )
+    fig.update_traces(line_color='#FF9900', line_width=2)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_top_subcategories(top_products):
+    fig = px.bar(
+        x=top_products.values,
+        y=top_products.index,
+        orientation='h',
+        title="Top 10 Subcategories",
+        labels={'x': 'Sales (₹)', 'y': 'Subcategory'},
+        color_discrete_sequence=['#2E86AB']
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_avg_rating(avg_rating_cat):
+    fig = px.bar(
+        x=avg_rating_cat.values,
+        y=avg_rating_cat.index,
+        orientation='h',
+        title="Average Customer Rating by Category",
+        labels={'x': 'Average Rating', 'y': 'Category'},
+        color=avg_rating_cat.values,
+        color_continuous_scale='viridis'
+    )
+    return fig
+
+# Not cached: the box plot needs row-level data, which would be hashed on every
+# rerun and stored again next to the filter_orders cache entry
+def fig_discount_distribution(discounts):
+    fig = px.box(
+        discounts,
+        x='Category',
+        y='Discount_Percent',
+        title="Discount Percent Distribution by Category",
+        color='Category',
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_segment_sales(seg_sales):
+    fig = px.pie(
+        values=seg_sales.values,
+        names=seg_sales.index,
+        title="Sales Distribution by Customer Segment",
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_top_cities(city_sales):
+    fig = px.bar(
+        x=city_sales.index,
+        y=city_sales.values,
+        title="Sales by City",
+        labels={'x': 'City', 'y': 'Sales (₹)'},
+        color=city_sales.values,
+        color_continuous_scale='viridis'
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_rating_distribution(rating_dist):
+    fig = px.bar(
+        x=rating_dist.index,
+        y=rating_dist.values,
+        title="Distribution of Customer Ratings",
+        labels={'x': 'Rating', 'y': 'Count'},
+        color=rating_dist.values,
+        color_continuous_scale='RdYlGn'
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_delivery_status(delivery_status):
+    fig = px.pie(
+        values=delivery_status.values,
+        names=delivery_status.index,
+        title="Delivery Performance",
+        color_discrete_sequence=['#2ECC71', '#E74C3C', '#F1C40F']
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_avg_delivery(avg_delivery):
+    fig = px.bar(
+        x=avg_delivery.values,
+        y=avg_delivery.index,
+        orientation='h',
+        title="Average Delivery Time by Category",
+        labels={'x': 'Average Days', 'y': 'Category'},
+        color=avg_delivery.values,
+        color_continuous_scale='blues'
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_delivery_days(delivery_days):
+    fig = px.bar(
+        x=delivery_days.index,
+        y=delivery_days.values,
+        title="Distribution of Delivery Days",
+        labels={'x': 'Delivery Days', 'y': 'Number of Orders'},
+        color_discrete_sequence=['#3498DB']
+    )
+    fig.update_layout(bargap=0)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_monthly_sales(month_sales):
+    fig = px.line(
+        x=month_sales.index,
+        y=month_sales.values,
+        title="Sales by Month",
+        labels={'x': 'Month', 'y': 'Sales (₹)'},
+        markers=True
+    )
+    fig.update_traces(line_color='#FF9900', line_width=3)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_weekday_sales(day_sales):
+    fig = px.bar(
+        x=day_sales.index,
+        y=day_sales.values,
+        title="Sales by Day of Week",
+        labels={'x': 'Day', 'y': 'Sales (₹)'},
+        color=day_sales.values,
+        color_continuous_scale='viridis'
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def fig_correlation(correlation):
+    fig = px.imshow(
+        correlation,
+        text_auto=True,
+        aspect="auto",
+        title="Correlation Matrix of Numerical Variables",
+        color_continuous_scale='RdBu'
+    )
+    fig.update_layout(height=500)
+    return fig
+
+options = load_data()
+
+if options is not None:
     # Sidebar
     st.sidebar.header("🎯 Dashboard Controls")
     
@@ -74,40 +403,23 @@ if df is not None:
     st.sidebar.subheader("Filters")
     
     # Category filter
-    categories = ['All'] + list(df['Category'].unique())
-    selected_category = st.sidebar.selectbox("Select Category", categories)
+    selected_category = st.sidebar.selectbox("Select Category", options['categories'])
     
     # City filter
-    cities = ['All'] + list(df['City'].unique())
-    selected_city = st.sidebar.selectbox("Select City", cities)
+    selected_city = st.sidebar.selectbox("Select City", options['cities'])
     
     # Customer segment filter
-    segments = ['All'] + list(df['Customer_Segment'].unique())
-    selected_segment = st.sidebar.selectbox("Customer Segment", segments)
+    selected_segment = st.sidebar.selectbox("Customer Segment", options['segments'])
     
     # Date range filter
     st.sidebar.subheader("Date Range")
-    min_date = df['Order_Date'].min().date()
-    max_date = df['Order_Date'].max().date()
-    start_date = st.sidebar.date_input("Start Date", min_date)
-    end_date = st.sidebar.date_input("End Date", max_date)
+    start_date = st.sidebar.date_input("Start Date", options['min_date'])
+    end_date = st.sidebar.date_input("End Date", options['max_date'])
     
     # Apply filters
-    filtered_df = df.copy()
-    
-    if selected_category != 'All':
-        filtered_df = filtered_df[filtered_df['Category'] == selected_category]
-    
-    if selected_city != 'All':
-        filtered_df = filtered_df[filtered_df['City'] == selected_city]
-    
-    if selected_segment != 'All':
-        filtered_df = filtered_df[filtered_df['Customer_Segment'] == selected_segment]
-    
-    filtered_df = filtered_df[
-        (filtered_df['Order_Date'].dt.date >= start_date) & 
-        (filtered_df['Order_Date'].dt.date <= end_date)
-    ]
+    filters = (selected_category, selected_city, selected_segment, start_date, end_date)
+    results = aggregate_orders(*filters)
+    kpis = results['summary']
     
     # Key Metrics
     st.subheader("📈 Key Performance Indicators")
@@ -115,24 +427,19 @@ if df is not None:
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        total_sales = filtered_df['Final_Price'].sum()
-        st.metric("Total Sales", f"₹{total_sales:,.0f}")
+        st.metric("Total Sales", f"₹{kpis['total_sales']:,.0f}")
     
     with col2:
-        avg_order_value = filtered_df['Final_Price'].mean()
-        st.metric("Avg Order Value", f"₹{avg_order_value:,.0f}")
+        st.metric("Avg Order Value", f"₹{kpis['avg_order_value']:,.0f}")
     
     with col3:
-        total_orders = len(filtered_df)
-        st.metric("Total Orders", f"{total_orders:,}")
+        st.metric("Total Orders", f"{kpis['total_orders']:,}")
     
     with col4:
-        avg_rating = filtered_df['Customer_Rating'].mean()
-        st.metric("Avg Rating", f"{avg_rating:.2f} ⭐")
+        st.metric("Avg Rating", f"{kpis['avg_rating']:.2f} ⭐")
     
     with col5:
-        return_rate = (filtered_df['Returned'] == 'Yes').mean() * 100
-        st.metric("Return Rate", f"{return_rate:.1f}%")
+        st.metric("Return Rate", f"{kpis['return_rate']:.1f}%")
     
     st.markdown("---")
     
@@ -153,43 +460,17 @@ if df is not None:
         with col1:
             # Sales by Category
             st.subheader("Sales by Category")
-            category_sales = filtered_df.groupby('Category')['Final_Price'].sum().sort_values(ascending=True)
-            fig = px.bar(
-                x=category_sales.values, 
-                y=category_sales.index,
-                orientation='h',
-                title="Total Sales by Category",
-                labels={'x': 'Total Sales (₹)', 'y': 'Category'},
-                color_discrete_sequence=['#FF9900']
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            cat_sales = results['by_category']['sales'].sort_values(ascending=True)
+            st.plotly_chart(fig_category_sales(cat_sales), use_container_width=True)
         
         with col2:
             # Payment Method Distribution
             st.subheader("Payment Methods")
-            payment_dist = filtered_df['Payment_Method'].value_counts()
-            fig = px.pie(
-                values=payment_dist.values,
-                names=payment_dist.index,
-                title="Payment Method Distribution",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_payment_methods(results['payment']), use_container_width=True)
         
         # Daily Sales Trend
         st.subheader("Daily Sales Trend")
-        daily_sales = filtered_df.groupby('Order_Date')['Final_Price'].sum().reset_index()
-        fig = px.line(
-            daily_sales, 
-            x='Order_Date', 
-            y='Final_Price',
-            title="Daily Sales Trend",
-            labels={'Final_Price': 'Sales (₹)', 'Order_Date': 'Date'}
-        )
-        fig.update_traces(line_color='#FF9900', line_width=2)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_daily_sales(results['daily']), use_container_width=True)
     
     with tab2:
         st.header("Product Analysis")
@@ -199,43 +480,18 @@ if df is not None:
         with col1:
             # Top Products by Sales
             st.subheader("Top 10 Subcategories by Sales")
-            top_products = filtered_df.groupby('Subcategory')['Final_Price'].sum().nlargest(10)
-            fig = px.bar(
-                x=top_products.values,
-                y=top_products.index,
-                orientation='h',
-                title="Top 10 Subcategories",
-                labels={'x': 'Sales (₹)', 'y': 'Subcategory'},
-                color_discrete_sequence=['#2E86AB']
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_top_subcategories(results['top_subcategories']), use_container_width=True)
         
         with col2:
             # Average Rating by Category
             st.subheader("Average Rating by Category")
-            avg_rating_cat = filtered_df.groupby('Category')['Customer_Rating'].mean().sort_values()
-            fig = px.bar(
-                x=avg_rating_cat.values,
-                y=avg_rating_cat.index,
-                orientation='h',
-                title="Average Customer Rating by Category",
-                labels={'x': 'Average Rating', 'y': 'Category'},
-                color=avg_rating_cat.values,
-                color_continuous_scale='viridis'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            avg_rating_cat = results['by_category']['rating'].sort_values()
+            st.plotly_chart(fig_avg_rating(avg_rating_cat), use_container_width=True)
         
         # Discount Analysis
         st.subheader("Discount Distribution by Category")
-        fig = px.box(
-            filtered_df,
-            x='Category',
-            y='Discount_Percent',
-            title="Discount Percent Distribution by Category",
-            color='Category',
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        discounts = filter_orders(*filters, columns=('Category', 'Discount_Percent'))
+        st.plotly_chart(fig_discount_distribution(discounts), use_container_width=True)
     
     with tab3:
         st.header("Customer Insights")
@@ -245,41 +501,16 @@ if df is not None:
         with col1:
             # Customer Segment Analysis
             st.subheader("Sales by Customer Segment")
-            segment_sales = filtered_df.groupby('Customer_Segment')['Final_Price'].sum()
-            fig = px.pie(
-                values=segment_sales.values,
-                names=segment_sales.index,
-                title="Sales Distribution by Customer Segment",
-                color_discrete_sequence=px.colors.qualitative.Pastel
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_segment_sales(results['segment']), use_container_width=True)
         
         with col2:
             # City-wise Analysis
             st.subheader("Top 10 Cities by Sales")
-            city_sales = filtered_df.groupby('City')['Final_Price'].sum().nlargest(10)
-            fig = px.bar(
-                x=city_sales.index,
-                y=city_sales.values,
-                title="Sales by City",
-                labels={'x': 'City', 'y': 'Sales (₹)'},
-                color=city_sales.values,
-                color_continuous_scale='viridis'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_top_cities(results['top_cities']), use_container_width=True)
         
         # Rating Distribution
         st.subheader("Customer Rating Distribution")
-        rating_dist = filtered_df['Customer_Rating'].value_counts().sort_index()
-        fig = px.bar(
-            x=rating_dist.index,
-            y=rating_dist.values,
-            title="Distribution of Customer Ratings",
-            labels={'x': 'Rating', 'y': 'Count'},
-            color=rating_dist.values,
-            color_continuous_scale='RdYlGn'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_rating_distribution(results['rating']), use_container_width=True)
     
     with tab4:
         st.header("Delivery Analytics")
@@ -289,41 +520,17 @@ if df is not None:
         with col1:
             # Delivery Status
             st.subheader("Delivery Status Distribution")
-            delivery_status = filtered_df['Delivery_Status'].value_counts()
-            fig = px.pie(
-                values=delivery_status.values,
-                names=delivery_status.index,
-                title="Delivery Performance",
-                color_discrete_sequence=['#2ECC71', '#E74C3C', '#F1C40F']
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_delivery_status(results['delivery_status']), use_container_width=True)
         
         with col2:
             # Average Delivery Days by Category
             st.subheader("Avg Delivery Days by Category")
-            avg_delivery = filtered_df.groupby('Category')['Delivery_Days'].mean().sort_values()
-            fig = px.bar(
-                x=avg_delivery.values,
-                y=avg_delivery.index,
-                orientation='h',
-                title="Average Delivery Time by Category",
-                labels={'x': 'Average Days', 'y': 'Category'},
-                color=avg_delivery.values,
-                color_continuous_scale='blues'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            avg_delivery = results['by_category']['delivery_days'].sort_values()
+            st.plotly_chart(fig_avg_delivery(avg_delivery), use_container_width=True)
         
         # Delivery Days Distribution
         st.subheader("Delivery Days Distribution")
-        fig = px.histogram(
-            filtered_df,
-            x='Delivery_Days',
-            nbins=20,
-            title="Distribution of Delivery Days",
-            labels={'Delivery_Days': 'Delivery Days', 'count': 'Number of Orders'},
-            color_discrete_sequence=['#3498DB']
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_delivery_days(results['delivery_days']), use_container_width=True)
     
     with tab5:
         st.header("Trends & Patterns")
@@ -333,47 +540,16 @@ if df is not None:
         with col1:
             # Monthly Sales Trend
             st.subheader("Monthly Sales Trend")
-            monthly_sales = filtered_df.groupby('Order_Month')['Final_Price'].sum()
-            fig = px.line(
-                x=monthly_sales.index,
-                y=monthly_sales.values,
-                title="Sales by Month",
-                labels={'x': 'Month', 'y': 'Sales (₹)'},
-                markers=True
-            )
-            fig.update_traces(line_color='#FF9900', line_width=3)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_monthly_sales(results['monthly']), use_container_width=True)
         
         with col2:
             # Day of Week Analysis
             st.subheader("Sales by Day of Week")
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            dow_sales = filtered_df.groupby('Order_DayName')['Final_Price'].sum().reindex(day_order)
-            fig = px.bar(
-                x=dow_sales.index,
-                y=dow_sales.values,
-                title="Sales by Day of Week",
-                labels={'x': 'Day', 'y': 'Sales (₹)'},
-                color=dow_sales.values,
-                color_continuous_scale='viridis'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig_weekday_sales(results['weekday']), use_container_width=True)
         
         # Correlation Heatmap
         st.subheader("Correlation Heatmap")
-        numeric_cols = ['Product_Price', 'Quantity', 'Discount_Percent', 'Final_Price', 
-                       'Customer_Rating', 'Delivery_Days', 'Profit_Margin']
-        corr_matrix = filtered_df[numeric_cols].corr()
-        
-        fig = px.imshow(
-            corr_matrix,
-            text_auto=True,
-            aspect="auto",
-            title="Correlation Matrix of Numerical Variables",
-            color_continuous_scale='RdBu'
-        )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig_correlation(results['correlation']), use_container_width=True)
     
     # Data Preview Section
     st.markdown("---")
@@ -381,37 +557,57 @@ if df is not None:
     
     if st.checkbox("Show Raw Data"):
         st.subheader("Filtered Data")
-        st.dataframe(filtered_df.head(100), use_container_width=True)
+        # Only the previewed rows leave DuckDB; explicit formats skip formatter inference
+        money = st.column_config.NumberColumn(format="₹%.2f")
+        count = st.column_config.NumberColumn(format="%d")
+        st.dataframe(
+            filter_orders(*filters, limit=100),
+            use_container_width=True,
+            column_config={
+                'Order_Date': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                'Delivery_Date': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                'Product_Price': money,
+                'Discount_Amount': money,
+                'Final_Price': money,
+                'Profit_Margin': money,
+                'Quantity': count,
+                'Discount_Percent': st.column_config.NumberColumn(format="%d%%"),
+                'Customer_Rating': count,
+                'Delivery_Days': count
+            }
+        )
         
-        # Download button for filtered data
-        csv = filtered_df.to_csv(index=False)
+        # Download button for filtered data; only the chosen format is serialized
+        file_format = st.radio("Download format", ['Parquet', 'CSV'], horizontal=True)
+        mime = {'Parquet': "application/vnd.apache.parquet", 'CSV': "text/csv"}[file_format]
         st.download_button(
-            label="📥 Download Filtered Data as CSV",
-            data=csv,
-            file_name="filtered_amazon_data.csv",
-            mime="text/csv"
+            label=f"📥 Download Filtered Data as {file_format}",
+            data=export_orders(*filters, file_format=file_format.lower()),
+            file_name=f"filtered_amazon_data.{file_format.lower()}",
+            mime=mime
         )
     
     # Key Insights
     st.markdown("---")
     st.header("💡 Key Insights")
+    by_category = results['by_category']
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="insight-box">', unsafe_allow_html=True)
         st.markdown("**📊 Sales Insights:**")
-        st.markdown(f"- Highest selling category: **{filtered_df.groupby('Category')['Final_Price'].sum().idxmax()}**")
-        st.markdown(f"- Most profitable category: **{filtered_df.groupby('Category')['Profit_Margin'].sum().idxmax()}**")
-        st.markdown(f"- Best rated category: **{filtered_df.groupby('Category')['Customer_Rating'].mean().idxmax()}**")
+        st.markdown(f"- Highest selling category: **{by_category['sales'].idxmax()}**")
+        st.markdown(f"- Most profitable category: **{by_category['profit'].idxmax()}**")
+        st.markdown(f"- Best rated category: **{by_category['rating'].idxmax()}**")
         st.markdown("</div>", unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="insight-box">', unsafe_allow_html=True)
         st.markdown("**📦 Operational Insights:**")
-        st.markdown(f"- Average delivery time: **{filtered_df['Delivery_Days'].mean():.1f} days**")
-        st.markdown(f"- On-time delivery rate: **{(filtered_df['Delivery_Status'] == 'On Time').mean()*100:.1f}%**")
-        st.markdown(f"- Most popular payment: **{filtered_df['Payment_Method'].mode()[0]}**")
+        st.markdown(f"- Average delivery time: **{kpis['avg_delivery_days']:.1f} days**")
+        st.markdown(f"- On-time delivery rate: **{kpis['on_time_rate']:.1f}%**")
+        st.markdown(f"- Most popular payment: **{results['payment'].index[0]}**")
         st.markdown("</div>", unsafe_allow_html=True)
 
 else:
@@ -1,15 +1,10 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
 
 def generate_amazon_sales_data(n_records=10000):
     """
     Generate synthetic Amazon sales data for EDA
     """
-    np.random.seed(42)
-    random.seed(42)
-    
     # Categories and subcategories
     categories = {
         'Electronics': ['Smartphones', 'Laptops', 'Headphones', 'Tablets', 'Cameras', 'Smart Watches'],
@@ -28,118 +23,135 @@ def generate_amazon_sales_data(n_records=10000):
     # Cities (Indian cities for diversity)
     cities = ['Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Kolkata', 'Pune', 'Hyderabad', 'Ahmedabad']
     
-    # Generate data
-    data = []
-    start_date = datetime(2023, 1, 1)
-    
-    for i in range(n_records):
-        # Random category and subcategory
-        category = random.choice(list(categories.keys()))
-        subcategory = random.choice(categories[category])
-        
-        # Price based on category
-        if category == 'Electronics':
-            price = np.random.uniform(500, 150000)
-        elif category == 'Clothing':
-            price = np.random.uniform(200, 5000)
-        elif category == 'Books':
-            price = np.random.uniform(100, 2000)
-        elif category == 'Home & Kitchen':
-            price = np.random.uniform(300, 30000)
-        else:  # Sports & Outdoors
-            price = np.random.uniform(500, 20000)
-        
-        # Quantity (1-5 items)
-        quantity = np.random.randint(1, 6)
-        
-        # Discount based on category and random chance
-        discount_percent = np.random.choice([0, 5, 10, 15, 20, 25, 30], p=[0.3, 0.2, 0.15, 0.1, 0.1, 0.08, 0.07])
-        discount_amount = (price * quantity * discount_percent) / 100
-        
-        # Final price after discount
-        final_price = (price * quantity) - discount_amount
-        
-        # Customer rating (3-5 stars, with some 1-2 stars for variety)
-        rating = np.random.choice([1, 2, 3, 4, 5], p=[0.02, 0.03, 0.15, 0.4, 0.4])
-        
-        # Review length indicator
-        review_length = np.random.choice(['Short', 'Medium', 'Long'], p=[0.3, 0.5, 0.2])
-        
-        # Delivery days (1-10 days)
-        delivery_days = np.random.randint(1, 11)
-        
-        # Delivery status
-        delivery_status = np.random.choice(['On Time', 'Delayed', 'Early'], p=[0.7, 0.2, 0.1])
-        
-        # Return status
-        return_status = np.random.choice(['No', 'Yes'], p=[0.92, 0.08])
-        
-        # Customer segment
-        customer_segment = random.choice(customer_segments)
-        
-        # Payment method
-        payment_method = random.choice(payment_methods)
-        
-        # City
-        city = random.choice(cities)
-        
-        # Order date (random date within last year)
-        order_date = start_date + timedelta(days=random.randint(0, 365))
-        
-        # Delivery date
-        delivery_date = order_date + timedelta(days=delivery_days)
-        
-        # Profit margin (20-40% of final price)
-        profit_margin = final_price * np.random.uniform(0.2, 0.4)
-        
-        record = {
-            'Order_ID': f'ORD{10000 + i}',
-            'Order_Date': order_date.strftime('%Y-%m-%d'),
-            'Delivery_Date': delivery_date.strftime('%Y-%m-%d'),
-            'Category': category,
-            'Subcategory': subcategory,
-            'Product_Price': round(price, 2),
-            'Quantity': quantity,
-            'Discount_Percent': discount_percent,
-            'Discount_Amount': round(discount_amount, 2),
-            'Final_Price': round(final_price, 2),
-            'Payment_Method': payment_method,
-            'Customer_Segment': customer_segment,
-            'City': city,
-            'Customer_Rating': rating,
-            'Review_Length': review_length,
-            'Delivery_Days': delivery_days,
-            'Delivery_Status': delivery_status,
-            'Returned': return_status,
-            'Profit_Margin': round(profit_margin, 2)
-        }
-        data.append(record)
+    # Price range (low, high) per category, aligned with the category order
+    price_ranges = {
+        'Electronics': (500, 150000),
+        'Clothing': (200, 5000),
+        'Books': (100, 2000),
+        'Home & Kitchen': (300, 30000),
+        'Sports & Outdoors': (500, 20000)
+    }
+    
+    # Generate data (one vectorized draw per column)
+    rng = np.random.default_rng(42)
+    start_date = np.datetime64('2023-01-01', 'ns')
+    
+    # Random category and subcategory
+    category_names = np.array(list(categories.keys()))
+    n_subcats = np.array([len(subcats) for subcats in categories.values()])
+    subcat_table = np.full((len(categories), n_subcats.max()), '', dtype=object)
+    for row, subcats in enumerate(categories.values()):
+        subcat_table[row, :len(subcats)] = subcats
+    
+    category_idx = rng.integers(0, len(categories), n_records)
+    subcategory_idx = rng.integers(0, n_subcats[category_idx])
+    
+    # Price based on category
+    low = np.array([price_ranges[c][0] for c in category_names], dtype=np.float64)
+    high = np.array([price_ranges[c][1] for c in category_names], dtype=np.float64)
+    price = rng.uniform(low[category_idx], high[category_idx])
+    
+    # Quantity (1-5 items)
+    quantity = rng.integers(1, 6, n_records)
+    
+    # Discount based on category and random chance
+    discount_percent = rng.choice([0, 5, 10, 15, 20, 25, 30], size=n_records,
+                                  p=[0.3, 0.2, 0.15, 0.1, 0.1, 0.08, 0.07])
+    discount_amount = (price * quantity * discount_percent) / 100
+    
+    # Final price after discount
+    final_price = (price * quantity) - discount_amount
+    
+    # Customer rating (3-5 stars, with some 1-2 stars for variety)
+    rating = rng.choice([1, 2, 3, 4, 5], size=n_records, p=[0.02, 0.03, 0.15, 0.4, 0.4])
+    
+    # Review length indicator
+    review_length = rng.choice(['Short', 'Medium', 'Long'], size=n_records, p=[0.3, 0.5, 0.2])
+    
+    # Delivery days (1-10 days)
+    delivery_days = rng.integers(1, 11, n_records)
+    
+    # Delivery status
+    delivery_status = rng.choice(['On Time', 'Delayed', 'Early'], size=n_records, p=[0.7, 0.2, 0.1])
+    
+    # Return status
+    return_status = rng.choice(['No', 'Yes'], size=n_records, p=[0.92, 0.08])
+    
+    # Customer segment, payment method and city
+    customer_segment = rng.choice(customer_segments, size=n_records)
+    payment_method = rng.choice(payment_methods, size=n_records)
+    city = rng.choice(cities, size=n_records)
+    
+    # Order date (random date within last year)
+    order_date = start_date + rng.integers(0, 366, n_records).astype('timedelta64[D]')
+    
+    # Delivery date
+    delivery_date = order_date + delivery_days.astype('timedelta64[D]')
+    
+    # Profit margin (20-40% of final price)
+    profit_margin = final_price * rng.uniform(0.2, 0.4, n_records)
     
     # Create DataFrame
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({
+        'Order_ID': np.char.add('ORD', (10000 + np.arange(n_records)).astype(str)),
+        'Order_Date': order_date,
+        'Delivery_Date': delivery_date,
+        'Category': category_names[category_idx],
+        'Subcategory': subcat_table[category_idx, subcategory_idx],
+        'Product_Price': np.round(price, 2),
+        'Quantity': quantity,
+        'Discount_Percent': discount_percent,
+        'Discount_Amount': np.round(discount_amount, 2),
+        'Final_Price': np.round(final_price, 2),
+        'Payment_Method': payment_method,
+        'Customer_Segment': customer_segment,
+        'City': city,
+        'Customer_Rating': rating,
+        'Review_Length': review_length,
+        'Delivery_Days': delivery_days,
+        'Delivery_Status': delivery_status,
+        'Returned': return_status,
+        'Profit_Margin': np.round(profit_margin, 2)
+    })
+    
+    # Add some derived columns (Order_Date is already datetime64, no parsing needed)
+    order_date = df['Order_Date'].dt
+    df['Order_Month'] = order_date.month.astype('int8')
+    df['Order_DayOfWeek'] = order_date.dayofweek.astype('int8')
+    df['Order_Quarter'] = order_date.quarter.astype('int8')
     
-    # Add some derived columns
-    df['Order_Month'] = pd.to_datetime(df['Order_Date']).dt.month
-    df['Order_DayOfWeek'] = pd.to_datetime(df['Order_Date']).dt.dayofweek
-    df['Order_Quarter'] = pd.to_datetime(df['Order_Date']).dt.quarter
+    # Day names for better visualization, ordered Monday to Sunday
+    df['Order_DayName'] = pd.Categorical(
+        order_date.day_name(),
+        categories=['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+        ordered=True
+    )
     
-    # Day names for better visualization
-    day_names = {0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 
-                 4: 'Friday', 5: 'Saturday', 6: 'Sunday'}
-    df['Order_DayName'] = df['Order_DayOfWeek'].map(day_names)
+    # 0/1 flags so return and on-time rates are a plain mean over a byte column
+    df['Returned_flag'] = (df['Returned'] == 'Yes').astype('uint8')
+    df['OnTime_flag'] = (df['Delivery_Status'] == 'On Time').astype('uint8')
+    
+    # Small integer ranges fit in a single byte
+    int8_cols = ['Quantity', 'Customer_Rating', 'Discount_Percent', 'Delivery_Days']
+    df[int8_cols] = df[int8_cols].astype('int8')
     
     return df
 
 def save_data():
     """
-    Generate and save the data to CSV
+    Generate and save the data to Parquet
     """
     print("Generating Amazon sales data...")
     df = generate_amazon_sales_data(10000)
     
-    # Save to CSV
-    df.to_csv('amazon_sales_data.csv', index=False)
-    print(f"Data saved to amazon_sales_data.csv")
+    # Store low-cardinality text as dictionary-encoded categoricals
+    categorical_cols = ['Category', 'City', 'Customer_Segment', 'Payment_Method',
+                        'Delivery_Status', 'Review_Length', 'Returned', 'Order_DayName']
+    df[categorical_cols] = df[categorical_cols].astype('category')
+    
+    # Save to Parquet
+    df.to_parquet('amazon_sales_data.parquet', engine='pyarrow', compression='zstd', index=False)
+    print(f"Data saved to amazon_sales_data.parquet")
     print(f"Shape of data: {df.shape}")
     print(f"\nFirst few rows:")
     print(df.head())